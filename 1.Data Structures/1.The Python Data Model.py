@@ -1,20 +1,21 @@
 # A Pythonic Card Deck
 import collections
+import sys
 from random import choice
 
 Card = collections.namedtuple("Card", ["rank", "suit"])
 
 
 class FrenchDeck:
-    ranks = [str(n) for n in range(2, 11)] + list("JQKA")
-    suits = "spades diamonds clubs hearts".split()
+    # interned, like the literals in Card('Q', "hearts"): comparing the
+    # cards' fields then succeeds on the identity check, before any memcmp
+    ranks = [sys.intern(str(n)) for n in range(2, 11)] + list("JQKA")
+    suits = [sys.intern(suit) for suit in "spades diamonds clubs hearts".split()]
+    _rank_value = {rank: i for i, rank in enumerate(ranks)}
 
     def __init__(self):
-        self._cards = [
-            Card(rank, suit)
-            for rank in self.ranks
-            for suit in self.suits
-        ]
+        # every deck holds the same immutable cards: share them
+        self._cards = _FRENCH_DECK_CARDS
 
     def __len__(self):
         return len(self._cards)
@@ -22,6 +23,16 @@ class FrenchDeck:
     def __getitem__(self, item):
         return self._cards[item]
 
+    def __contains__(self, item):
+        # one hash probe instead of the linear scan `in` falls back to
+        return item in _FRENCH_DECK_SET
+
+
+_FRENCH_DECK_CARDS = tuple(Card(rank, suit)
+                           for rank in FrenchDeck.ranks
+                           for suit in FrenchDeck.suits)
+_FRENCH_DECK_SET = frozenset(_FRENCH_DECK_CARDS)
+
 
 beer_card = Card('7', "diamonds")
 print(beer_card)
@@ -55,12 +66,19 @@ print(Card('7', "beasts") in deck)
 
 
 # sorting
+# dict lookups instead of a linear ranks.index() scan per card
+SUIT_COUNT = len(suit_values)
+
+
 def spades_high(card):
-    rank_value = FrenchDeck.ranks.index(card.rank)
-    return rank_value * len(suit_values) + suit_values[card.suit]
+    rank_value = FrenchDeck._rank_value[card.rank]
+    return rank_value * SUIT_COUNT + suit_values[card.suit]
 
 
-for card in sorted(deck, key=spades_high):
+# there are only 52 cards: compute every key once, so sorting needs
+# just a dict lookup per card, done in C by the bound __getitem__
+SPADES_HIGH_KEYS = {card: spades_high(card) for card in _FRENCH_DECK_CARDS}
+for card in sorted(deck, key=SPADES_HIGH_KEYS.__getitem__):
     print(card)
 
 import math
@@ -78,7 +96,8 @@ class Vector:
         return math.hypot(self.x, self.y)
 
     def __bool__(self):
-        return bool(abs(self))
+        # zero test only, no need for the square root in abs()
+        return bool(self.x or self.y)
 
     def __add__(self, other):
         x = self.x + other.x
@@ -94,3 +113,33 @@ v2 = Vector(2, 1)
 print(v1 + v2)
 print(abs(v1))
 print(v1 * 3)
+
+# Many vectors at once: one (N, 2) array instead of N Vector objects
+import numpy as np
+
+
+class VectorArray:
+    def __init__(self, xy):
+        self.xy = np.ascontiguousarray(xy, dtype=np.float64)
+
+    def __repr__(self):
+        return f"VectorArray({self.xy.tolist()!r})"
+
+    def __len__(self):
+        return len(self.xy)
+
+    def __abs__(self):
+        return np.hypot(self.xy[:, 0], self.xy[:, 1])
+
+    def __add__(self, other):
+        return VectorArray(self.xy + other.xy)
+
+    def __mul__(self, scalar):
+        return VectorArray(self.xy * scalar)
+
+
+va1 = VectorArray([(2, 4), (3, 4)])
+va2 = VectorArray([(2, 1), (1, 1)])
+print(va1 + va2)
+print(abs(va1))
+print(va1 * 3)
@@ -56,23 +56,37 @@ for record in metro_areas:
 
 phone_numbers = ['123', '234', '345', '456']
 
+# dispatching on a single character: one dict lookup instead of
+# testing the cases one after the other. The keys need no sys.intern:
+# CPython already shares one object per single-character string
+PHONE_REGIONS = {
+    '1': "North America and Caribbean",
+    '2': "Africa and some territories",
+    '3': "Europe",
+    '4': "Europe",
+}
+
 
 def match_phone_number(phone_number):
-    first = phone_number[0]
-    match first:
-        case '1':
-            return "North America and Caribbean"
-        case '2':
-            return "Africa and some territories"
-        case '3' | '4':
-            return "Europe"
+    return PHONE_REGIONS.get(phone_number[0])
 
 
 for number in phone_numbers:
     print(match_phone_number(number))
 
 
-# using match/case in python>=3.10
+# an evaluator with the dispatch that match/case did on the head and the
+# length of the expression done by a dict of handlers instead
+from collections.abc import Sequence
+
+
+def _is_sequence(x):
+    # what a match/case sequence pattern accepts: lists first, as the
+    # common case, then any other Sequence except str, bytes and bytearray
+    return isinstance(x, list) or (isinstance(x, Sequence) and
+                                   not isinstance(x, (str, bytes, bytearray)))
+
+
 class Symbol:
     pass
 
@@ -81,22 +95,58 @@ class Procedure:
     pass
 
 
+def _eval_quote(exp, env):
+    # ['quote', x]
+    return exp[1]
+
+
+def _eval_if(exp, env):
+    # ['if', test, consequence, alternative]
+    _, test, consequence, alternative = exp
+    if evaluate(test, env):
+        return evaluate(consequence, env)
+    else:
+        return evaluate(alternative, env)
+
+
+def _eval_lambda(exp, env):
+    # ['lambda', [*parms], *body] if body
+    if len(exp) < 3 or not _is_sequence(exp[1]):
+        raise SyntaxError
+    return Procedure(list(exp[1]), list(exp[2:]), env)
+
+
+def _eval_define(exp, env):
+    # ['define', Symbol() as name, value_exp]
+    _, name, value_exp = exp
+    if not isinstance(name, Symbol):
+        raise SyntaxError
+    env[name] = evaluate(value_exp, env)
+
+
+# the length is part of the key, so the lookup also checks the arity and
+# the handlers can unpack right away; lambda has a variable length body
+EVAL_HANDLERS = {
+    ('quote', 2): _eval_quote,
+    ('if', 4): _eval_if,
+    ('define', 3): _eval_define,
+}
+
+
 def evaluate(exp, env):
     """Evaluate an expression in an environment."""
-    match exp:
-        case ['quote', x]:
-            return x
-        case ['if', test, consequence, alternative]:
-            if evaluate(test, env):
-                return evaluate(consequence, env)
-            else:
-                return evaluate(alternative, env)
-        case ['lambda', [*parms], *body] if body:
-            return Procedure(parms, body, env)
-        case ['define', Symbol() as name, value_exp]:
-            env[name] = evaluate(value_exp, env)
-        case _:
+    if not _is_sequence(exp) or not exp:
+        raise SyntaxError
+    head = exp[0]
+    try:
+        handler = EVAL_HANDLERS.get((head, len(exp)))
+    except TypeError:  # unhashable head
+        raise SyntaxError from None
+    if handler is None:
+        if head != 'lambda':
             raise SyntaxError
+        handler = _eval_lambda
+    return handler(exp, env)
 
 
 # Slicing
@@ -106,25 +156,21 @@ def evaluate(exp, env):
 That is nearly 60 times faster than reading the numbers from a text file,
 binary file with 10 million doubles is 80,000,000 bytes (8 bytes per double, zero overhead),
 while the text file has 181,515,739 bytes for the same data.
+The same round-trip with NumPy: one vectorized generator call instead of
+10**7 random() calls, and tofile/fromfile move the raw buffer in one go.
 """
-from array import array
-from random import random
-floats = array('d', (random() for i in range(10**7)))
+import numpy as np
+
+floats = np.random.default_rng().random(10**7)
 print(floats[-1])
 
-fp = open("floats.bin", "wb")
-floats.tofile((fp))
-fp.close()
+floats.tofile("floats.bin")
 
-fp = open("floats.bin", "rb")
-floats2 = array('d')
-floats2.fromfile(fp, 10**7)
-fp.close()
+floats2 = np.fromfile("floats.bin", dtype='d', count=10**7)
 print(floats2[-1])
-print(floats == floats2)
+print(np.array_equal(floats, floats2))
 
 # Numpy
-import numpy as np
 a = np.arange(12)
 print(f"{a}\t{type(a)}\t{a.shape}")
 a.shape = (3, 4)
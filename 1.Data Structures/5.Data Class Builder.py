@@ -31,6 +31,11 @@ class Coordinate(typing.NamedTuple):
         we = 'E' if self.lon >= 0 else 'W'
         return f'{abs(self.lat):.1f}°{ns}, {abs(self.lon):.1f}°{we}'
 
+# typing.NamedTuple builds its class with collections.namedtuple, so both
+# share the same generated __new__: constructing either costs the same.
+# Only a C type (a structseq, or a Cython extension class) would avoid
+# running that Python __new__ for each instance
+
 
 from dataclasses import dataclass
 
@@ -9,10 +9,15 @@ Concrete strategies:
 FidelityPromo: discount()
 BulkPromo: discount()
 LargeOrderPromo: discount()
+
+Amounts in this first version are int cents: integer arithmetic is much
+cheaper than Decimal, and Decimal is only built for display.
 """
 
+import sys
 from abc import ABC, abstractmethod
 from collections.abc import Sequence
+from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import NamedTuple, Optional
 
@@ -20,85 +25,211 @@ class Customer(NamedTuple):
     name: str
     fidelity: int
 
-class LineItem(NamedTuple):
+# slotted dataclasses: attribute reads are C slot descriptors instead of
+# namedtuple's per-field tuple index lookups, which the promotions hit often
+@dataclass(frozen=True, slots=True)
+class LineItem:
     product: str
     quantity: int
-    price: Decimal
+    price_cents: int
 
-    def total(self) -> Decimal:
-        return self.price * self.quantity
+    def __post_init__(self):
+        # a shop sells a finite set of products: interned names let the
+        # distinct-product set compare them by identity
+        object.__setattr__(self, 'product', sys.intern(self.product))
 
-class Order(NamedTuple):
+    def total(self) -> int:
+        return self.price_cents * self.quantity
+
+@dataclass(frozen=True, slots=True)
+class Order:
     customer: Customer
     cart: Sequence[LineItem]
     promotion: Optional["Promotion"] = None
-
-    def total(self) -> Decimal:
-        totals = (item.total() for item in self.cart)
-        return sum(totals, start=Decimal(0))
-
-    def due(self) -> Decimal:
+    _total: int = field(init=False, repr=False, compare=False)
+    _distinct_products: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # the order is immutable: compute what every promotion asks for once.
+        # frozen does not freeze a list cart, so snapshot it first: the
+        # cached values must not go stale if the caller's list changes
+        object.__setattr__(self, 'cart', tuple(self.cart))
+        total = 0
+        for item in self.cart:
+            total += item.price_cents * item.quantity
+        object.__setattr__(self, '_total', total)
+        object.__setattr__(self, '_distinct_products',
+                           len({item.product for item in self.cart}))
+
+    def total(self) -> int:
+        return self._total
+
+    def due(self) -> int:
         if self.promotion is None:
-            discount = Decimal(0)
+            discount = 0
         else:
             discount = self.promotion.discount(self)
         return self.total() - discount
 
     def __repr__(self):
-        return f'<Order total: {self.total():.2f} due: {self.due():.2f}>'
+        total = Decimal(self.total()) / 100
+        due = Decimal(self.due()) / 100
+        return f'<Order total: {total:.2f} due: {due:.2f}>'
 class Promotion(ABC): # the Strategy: an abstract base class
     @abstractmethod
-    def discount(self, order: Order) -> Decimal:
-        """Return discount as a positive dollar amount"""
+    def discount(self, order: Order) -> int:
+        """Return discount as a positive amount in cents, rounded down"""
 
 class FidelityPromo(Promotion): # first Concrete Strategy
     """5% discount for customers with 1000 or more fidelity points"""
-    def discount(self, order: Order) -> Decimal:
-        rate = Decimal("0.05")
+    def discount(self, order: Order) -> int:
         if order.customer.fidelity >= 1000:
-            return order.total() * rate
-        return Decimal(0)
+            return order.total() * 5 // 100
+        return 0
 
 class BulkItemPromo(Promotion): # second Concrete Strategy
     """10% discount for each LineItem with 20 or more units"""
-    def discount(self, order: Order) -> Decimal:
-        discount = Decimal(0)
+    def discount(self, order: Order) -> int:
+        discount = 0
         for item in order.cart:
             if item.quantity >= 20:
-                discount += item.total() * Decimal('0.1')
+                discount += item.total() * 10 // 100
         return discount
 
 class LargeOrderPromo(Promotion): # third Concrete Strategy
     """7% discount for orders with 10 or more distinct items"""
-    def discount(self, order: Order) -> Decimal:
-        distinct_items = {item.product for item in order.cart}
-        if len(distinct_items) >= 10:
-            return order.total() * Decimal('0.07')
-        return Decimal(0)
+    def discount(self, order: Order) -> int:
+        if order._distinct_products >= 10:
+            return order.total() * 7 // 100
+        return 0
 
 # Sample usage of Order class with different promotions applied
 joe = Customer("John Doe", 0)
 ann = Customer("Ann Smith", 1100)
-cart = (LineItem("banana", 4, Decimal('.5')),
-        LineItem("apple", 10, Decimal("1.5")),
-        LineItem("watermelon", 5, Decimal(5)))
+cart = (LineItem("banana", 4, 50),
+        LineItem("apple", 10, 150),
+        LineItem("watermelon", 5, 500))
 print(Order(joe, cart, FidelityPromo()))
 print(Order(ann, cart, FidelityPromo()))
-banana_cart = (LineItem("banana", 30, Decimal('.5')),
-               LineItem("apple", 10, Decimal('1.5')))
+banana_cart = (LineItem("banana", 30, 50),
+               LineItem("apple", 10, 150))
 print(Order(joe, banana_cart, BulkItemPromo()))
-long_cart = tuple(LineItem(str(sku), 1, Decimal(1)) for sku in range(10))
+long_cart = tuple(LineItem(str(sku), 1, 100) for sku in range(10))
 print(Order(joe, long_cart, LargeOrderPromo()))
 print(Order(joe, cart, LargeOrderPromo()))
 print("==============================================")
 
+# The same promotions over a cart stored as one array per LineItem field:
+# the totals and the bulk discount become vectorized NumPy operations
+import numpy as np
+
+@dataclass(frozen=True)
+class OrderArrays:
+    customer: Customer
+    product: np.ndarray  # object
+    qty: np.ndarray  # int64
+    price: np.ndarray  # int64, cents
+
+    @classmethod
+    def from_cart(cls, customer: Customer, cart: Sequence[LineItem]) -> "OrderArrays":
+        return cls(customer,
+                   np.array([item.product for item in cart], dtype=object),
+                   np.array([item.quantity for item in cart], dtype=np.int64),
+                   np.array([item.price_cents for item in cart], dtype=np.int64))
+
+    def total(self) -> int:
+        return int((self.qty * self.price).sum())
+
+def fidelity_discount(order: OrderArrays) -> int:
+    """5% discount for customers with 1000 or more fidelity points"""
+    if order.customer.fidelity >= 1000:
+        return order.total() * 5 // 100
+    return 0
+
+def bulk_item_discount(order: OrderArrays) -> int:
+    """10% discount for each LineItem with 20 or more units"""
+    bulk = order.qty >= 20
+    return int((order.qty[bulk] * order.price[bulk] * 10 // 100).sum())
+
+def large_order_discount(order: OrderArrays) -> int:
+    """7% discount for orders with 10 or more distinct items"""
+    if np.unique(order.product).size >= 10:
+        return order.total() * 7 // 100
+    return 0
+
+print(fidelity_discount(OrderArrays.from_cart(ann, cart)))
+print(bulk_item_discount(OrderArrays.from_cart(joe, banana_cart)))
+print(large_order_discount(OrderArrays.from_cart(joe, long_cart)))
+
+# Many carts at once: the line items of all carts are concatenated and
+# cart i owns items offsets[i]:offsets[i+1], so each promotion is computed
+# for every cart with a few array operations instead of a loop over carts
+@dataclass(frozen=True)
+class CartBatch:
+    fidelity: np.ndarray  # int64, one per cart
+    product: np.ndarray  # int64 product ids, one per line item
+    qty: np.ndarray  # int64, one per line item
+    price: np.ndarray  # int64 cents, one per line item
+    offsets: np.ndarray  # int64, number of carts + 1
+
+    @classmethod
+    def from_orders(cls, orders: Sequence[OrderArrays]) -> "CartBatch":
+        offsets = np.zeros(len(orders) + 1, dtype=np.int64)
+        np.cumsum([len(order.qty) for order in orders], out=offsets[1:])
+        _, product_ids = np.unique(np.concatenate([order.product for order in orders]),
+                                   return_inverse=True)
+        return cls(np.array([order.customer.fidelity for order in orders], dtype=np.int64),
+                   product_ids.astype(np.int64),
+                   np.concatenate([order.qty for order in orders]),
+                   np.concatenate([order.price for order in orders]),
+                   offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def per_cart(self, values: np.ndarray) -> np.ndarray:
+        """Sum per-item values into one value per cart"""
+        sums = np.concatenate(([0], np.cumsum(values)))
+        return sums[self.offsets[1:]] - sums[self.offsets[:-1]]
+
+    def totals(self) -> np.ndarray:
+        return self.per_cart(self.qty * self.price)
+
+def fidelity_discounts(batch: CartBatch) -> np.ndarray:
+    return np.where(batch.fidelity >= 1000, batch.totals() * 5 // 100, 0)
+
+def bulk_item_discounts(batch: CartBatch) -> np.ndarray:
+    line_discounts = batch.qty * batch.price * 10 // 100
+    return batch.per_cart(np.where(batch.qty >= 20, line_discounts, 0))
+
+def large_order_discounts(batch: CartBatch) -> np.ndarray:
+    carts = np.repeat(np.arange(len(batch)), np.diff(batch.offsets))
+    num_products = int(batch.product.max(initial=-1)) + 1
+    cart_products = np.unique(carts * num_products + batch.product)
+    distinct = np.bincount(cart_products // max(num_products, 1), minlength=len(batch))
+    return np.where(distinct >= 10, batch.totals() * 7 // 100, 0)
+
+batch = CartBatch.from_orders([OrderArrays.from_cart(customer, a_cart)
+                               for customer in (joe, ann)
+                               for a_cart in (cart, banana_cart, long_cart)])
+print(fidelity_discounts(batch))
+print(bulk_item_discounts(batch))
+print(large_order_discounts(batch))
+print("==============================================")
+
 # Function-Oriented Strategy
 # Order class with discount strategies implemented as functions
 from collections.abc import Sequence
-from dataclasses import dataclass
-from decimal import Decimal
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_DOWN
 from typing import Optional, Callable, NamedTuple
 
+# parsed once: building a Decimal from a string in every promo call is slow
+_FIDELITY_RATE = Decimal('0.05')
+_BULK_RATE = Decimal('0.1')
+_LARGE_RATE = Decimal('0.07')
+_ZERO = Decimal(0)
+
 class Customer(NamedTuple):
     name: str
     fidelity: int
@@ -117,41 +248,53 @@ class Order:  # the context
     cart: Sequence[LineItem]
     # Callable type; Callable[[int], str] is a function of (int) -> str
     promotion: Optional[ Callable[["Order"], Decimal] ] = None
+    _total: Decimal = field(init=False, repr=False, compare=False)
+    _distinct_products: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # the order is frozen: walk the cart once here instead of on every
+        # total() call from due(), __repr__ and each promotion. The cart is
+        # snapshot first, as a caller's list can still change afterwards
+        object.__setattr__(self, 'cart', tuple(self.cart))
+        total = Decimal(0)
+        for item in self.cart:
+            total += item.price * item.quantity
+        object.__setattr__(self, '_total', total)
+        object.__setattr__(self, '_distinct_products',
+                           len({item.product for item in self.cart}))
 
     def total(self) -> Decimal:
-        totals = (item.total() for item in self.cart)
-        return sum(totals, start=Decimal(0))
+        return self._total
 
     def due(self) -> Decimal:
         if self.promotion is None:
             discount = Decimal(0)
         else:
             discount = self.promotion(self)
-        return self.total() - discount
+        return self._total - discount
 
     def __repr__(self):
-        return f'<Order total: {self.total():.2f} due: {self.due():.2f}>'
+        return f'<Order total: {self._total:.2f} due: {self.due():.2f}>'
 
 def fidelity_promo(order: Order) -> Decimal:
     """5% discount for customers with 1000 or more fidelity points"""
     if order.customer.fidelity >= 1000:
-        return order.total() * Decimal('0.05')
-    return Decimal(0)
+        return order.total() * _FIDELITY_RATE
+    return _ZERO
 
 def bulk_item_promo(order: Order) -> Decimal:
     """10% discount for each LineItem with 20 or more units"""
-    discount = Decimal(0)
+    bulk_total = _ZERO
     for item in order.cart:
         if item.quantity >= 20:
-            discount += item.total() * Decimal('0.1')
-    return discount
+            bulk_total += item.total()
+    return bulk_total * _BULK_RATE
 
 def large_order_promo(order: Order) -> Decimal:
     """7% discount for orders with 10 or more distinct items"""
-    distinct_items = {item.product for item in order.cart}
-    if len(distinct_items) >= 10:
-        return order.total() * Decimal('0.07')
-    return Decimal(0)
+    if order._distinct_products >= 10:
+        return order.total() * _LARGE_RATE
+    return _ZERO
 
 joe = Customer("John Doe", 0)
 ann = Customer("Ann Smith", 1100)
@@ -179,7 +322,11 @@ print("============================================="
 promos = [fidelity_promo, bulk_item_promo, large_order_promo]
 def best_promo(order: Order) -> Decimal:
     """Compute the best discount available"""
-    return max(promo(order) for promo in promos)
+    # same as max(promo(order) for promo in promos), without the generator
+    a = fidelity_promo(order)
+    b = bulk_item_promo(order)
+    c = large_order_promo(order)
+    return a if a >= b and a >= c else (b if b >= c else c)
 
 print(Order(joe, long_cart, best_promo))
 print(Order(joe, banana_cart, best_promo))
@@ -202,34 +349,90 @@ def promotion(promo: Promotion) -> Promotion:
 
 def best_promo(order: Order) -> Decimal:
     """Compute the best discount available"""
-    return max(promo(order) for promo in promos)
+    # order.total() is computed once per Order, so the promos can all call it
+    best = _ZERO
+    for promo in promos:
+        discount = promo(order)
+        if discount > best:
+            best = discount
+    return best
 
 @promotion
 def fidelity(order: Order) -> Decimal:
     """5% discount for customers with 1000 or more fidelity points"""
     if order.customer.fidelity >= 1000:
-        return order.total() * Decimal('0.05')
-    return Decimal(0)
+        return order.total() * _FIDELITY_RATE
+    return _ZERO
 
 @promotion
 def bulk_item(order: Order) -> Decimal:
     """10% discount for each LineItem with 20 or more units"""
-    discount = Decimal(0)
+    bulk_total = _ZERO
     for item in order.cart:
         if item.quantity >= 20:
-            discount += item.total() * Decimal('0.1')
-    return discount
+            bulk_total += item.total()
+    return bulk_total * _BULK_RATE
 
 @promotion
 def large_order(order: Order) -> Decimal:
     """7% discount for orders with 10 or more distinct items"""
-    distinct_items = {item.product for item in order.cart}
-    if len(distinct_items) >= 10:
-        return order.total() * Decimal("0.07")
-    return Decimal(0)
+    if order._distinct_products >= 10:
+        return order.total() * _LARGE_RATE
+    return _ZERO
 
 print(promos)
 
+# Many orders at once, e.g. an end of day batch: the orders become the
+# CartBatch arrays of the first version, priced in int cents, and the
+# three discounts are computed for all of them with a few array operations
+def _price_cents(price: Decimal) -> int:
+    cents = price * 100
+    if cents != cents.to_integral_value():
+        raise ValueError(f'price {price} is not a whole number of cents')
+    return int(cents)
+
+def orders_to_batch(orders: Sequence[Order]) -> CartBatch:
+    return CartBatch.from_orders([
+        OrderArrays(order.customer,
+                    np.array([item.product for item in order.cart], dtype=object),
+                    np.array([item.quantity for item in order.cart], dtype=np.int64),
+                    np.array([_price_cents(item.price) for item in order.cart],
+                             dtype=np.int64))
+        for order in orders])
+
+def _bulk_item_batch(batch: CartBatch) -> np.ndarray:
+    # bulk_item discounts the sum of the bulk lines: floor once per cart,
+    # not once per line as bulk_item_discounts does
+    bulk_totals = batch.per_cart(np.where(batch.qty >= 20, batch.qty * batch.price, 0))
+    return bulk_totals * 10 // 100
+
+# the registered promotions with an array version, in cents rounded down
+_BATCH_PROMOS = {fidelity: fidelity_discounts,
+                 bulk_item: _bulk_item_batch,
+                 large_order: large_order_discounts}
+
+def best_promo_batch(orders: Sequence[Order]) -> list[Decimal]:
+    """Compute best_promo of each order, rounded down to the cent. Prices
+    must be whole cents. Promotions registered without an array version
+    are called order by order"""
+    if not orders:
+        return []
+    batch = orders_to_batch(orders)
+    best = np.zeros(len(orders), dtype=np.int64)
+    for promo in promos:
+        batch_promo = _BATCH_PROMOS.get(promo)
+        if batch_promo is not None:
+            cents = batch_promo(batch)
+        else:
+            cents = [int(promo(order).scaleb(2).to_integral_value(ROUND_DOWN))
+                     for order in orders]
+        np.maximum(best, cents, out=best)
+    return [Decimal(int(cents)).scaleb(-2) for cents in best]
+
+print(best_promo_batch([Order(joe, long_cart),
+                        Order(joe, banana_cart),
+                        Order(ann, cart)]))
+
 """
 Command Pattern
 Command is another design pattern that can be simplified by the use of functions
@@ -78,6 +78,42 @@ my_tag = {"name": "img", "title": "Sunset Boulevard",
           "src": "sunset.jpg", "class": "framed"}
 print(tag(my_tag))
 
+# tag() sorts the attributes and rebuilds the markup around them on every
+# call. When a loop renders the same tag with the same attribute names,
+# that work can be done once, in a closure specialized for those names
+def make_tag_renderer(name, attr_names=()):
+    """Return a function rendering `name` tags with exactly these attributes"""
+    attr_names = tuple(sorted(attr_names))
+    escaped = name.replace('{', '{{').replace('}', '}}')
+    head = '<' + escaped + ''.join(
+        ' {}={{{}}}'.format(attr.replace('{', '{{').replace('}', '}}'), i)
+        for i, attr in enumerate(attr_names))
+    end_tag = f'</{name}>'
+
+    def render(*content, **attrs):
+        values = [attrs[attr] for attr in attr_names]
+        if content:
+            start_tag = head.format(*values) + '>'
+            return '\n'.join([start_tag + str(c) + end_tag for c in content])
+        return head.format(*values) + ' />'
+    return render
+
+_tag_renderers = {}
+
+def fast_tag(name, *content, class_=None, **attrs):
+    """Same output as tag, reusing one renderer per tag and attribute names"""
+    if class_ is not None:
+        attrs["class"] = class_
+    key = (name, tuple(attrs))
+    try:
+        render = _tag_renderers[key]
+    except KeyError:
+        render = _tag_renderers[key] = make_tag_renderer(name, attrs)
+    return render(*content, **attrs)
+
+print(fast_tag('p', "hello", "world", class_="sidebar"))
+print(fast_tag(**my_tag))
+
 # Positional-Only Parameters
 def divmod(a, b, /):
     return (a // b, a % b)
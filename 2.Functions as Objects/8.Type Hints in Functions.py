@@ -8,13 +8,20 @@ about 60% of the chapter
 • Limitations and downsides of type hints and static typing
 """
 import typing
+import heapq
+import os
 import sys
+import pickle
+import random
+import tempfile
 import re
 import unicodedata
 from typing import Optional, Union, NamedTuple, TypeVar, Any, Protocol, NoReturn
 from collections.abc import Sequence, Iterator, Iterable, Mapping, Hashable, Callable
+from functools import cache
+from pathlib import Path
 from random import shuffle
-from collections import Counter
+from collections import Counter, defaultdict
 from decimal import Decimal
 from fractions import Fraction
 
@@ -75,12 +82,35 @@ def double(x: object) -> object:
 def show_count(plural: Optional[str] = None) -> str:
     pass
 
+# ASCII chars that can start something float() accepts: signs, digits,
+# the point, inf/nan and the whitespace it strips. Non-ASCII digits and
+# spaces are accepted too, so non-ASCII tokens are never screened out
+_NUM_START = frozenset('+-.0123456789iInN' +
+                       ''.join(c for c in map(chr, range(128)) if c.isspace()))
+
 def parse_token(token: str) -> Union[str, float]:
+    # most words fail here, without a ValueError raised and caught
+    if not token or (token[0] not in _NUM_START and token[0].isascii()):
+        return token
     try:
         return float(token)
     except ValueError:
         return token
 
+@cache
+def make_row_parser(types: tuple[type, ...]) -> Callable[[Sequence[str]], tuple]:
+    """parser for rows whose column types are known in advance: the source
+    hardcodes float(row[i]) or row[i] per column, so no cell goes through
+    parse_token's guessing. One parser is compiled per types tuple"""
+    cells = ''.join(f'float(row[{i}]), ' if t is float else f'row[{i}], '
+                    for i, t in enumerate(types))
+    namespace: dict[str, Any] = {}
+    exec(f'def parse_row(row):\n    return ({cells})\n', namespace)
+    return namespace['parse_row']
+
+parse_row = make_row_parser((str, float, float))
+print(parse_row(['Tokyo', '35.69', '139.69']))
+
 # Generic Collections
 def tokenize(text: str) -> list[str]:
     return text.upper().split()
@@ -101,34 +131,105 @@ def display(lat_lon: tuple[float, float]) -> str:
     ew = 'E' if lon >= 0 else 'W'
     return f'{abs(lat):0.1f}°{ns}, {abs(lon):0.1f}°{ew}'
 
+def display_batch(lats: Sequence[float], lons: Sequence[float]) -> list[str]:
+    """display for many points kept as two parallel sequences: the body of
+    display inlined into one comprehension, with no display call or
+    Coordinate per point"""
+    return [f'{abs(lat):0.1f}°{"N" if lat >= 0 else "S"}, '
+            f'{abs(lon):0.1f}°{"E" if lon >= 0 else "W"}'
+            for lat, lon in zip(lats, lons)]
+
 # • Tuples as immutable sequences
 animals = 'drake fawn heron ibex koala lynx tahr xerus yak zapus'.split()
 def columnize(sequence: Sequence[str], num_columns: int=0) -> list[tuple[str, ...]]:
+    n = len(sequence)
     if num_columns == 0:
-        num_columns = round(len(sequence) ** 0.5)
-    num_rows, reminder = divmod(len(sequence), num_columns)
-    num_rows += bool(reminder)
-    return [tuple(sequence[i::num_rows]) for i in range(num_rows)]
+        num_columns = round(n ** 0.5)
+    # ceiling division: no divmod tuple and no remainder test
+    num_rows = -(-n // num_columns)
+    # slicing a tuple gives each row as a tuple directly, instead of a
+    # list slice copied again by tuple()
+    items = tuple(sequence)
+    return [items[i::num_rows] for i in range(num_rows)]
 table = columnize(animals)
 print(table)
 
+def columnize_text(sequence: Sequence[str], num_columns: int=0) -> str:
+    """the columnize table as text, one row per line, for callers that only
+    print it: rows are joined straight from the slices, no list of tuples"""
+    n = len(sequence)
+    if num_columns == 0:
+        num_columns = round(n ** 0.5)
+    num_rows = -(-n // num_columns)
+    items = tuple(sequence)
+    return '\n'.join(' '.join(items[i::num_rows]) for i in range(num_rows))
+print(columnize_text(animals))
+
 
 # Generic Mappings
 RE_WORD = re.compile(r'\w+')
 STOP_CODE = sys.maxunicode + 1
 def tokenize(text: str) -> Iterator[str]:
     """return iterable of upper"""
-    for match in RE_WORD.finditer(text):
-        yield match.group().upper()
-
-def name_index(start: int=32, end: int=STOP_CODE) -> dict[str,set[str]]:
-    index: dict[str, set[str]] = {}
-    for char in (chr(i) for i in range(start, end)):
-        if name:= unicodedata.name(char, ''):
-            for word in tokenize(name):
-                index.setdefault(word, set()).add(char)
+    # findall builds the word strings in C, no match object per word
+    return map(str.upper, RE_WORD.findall(text))
+
+# bump when the layout of the pickled index changes
+NAME_INDEX_VERSION = 2
+
+def name_index(start: int=32, end: int=STOP_CODE) -> dict[str,str]:
+    """the index only depends on the Unicode database, so it is pickled
+    once under the user cache dir and loaded from there afterwards"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    key = f'name_index-{NAME_INDEX_VERSION}-{unicodedata.unidata_version}-{start}-{end}.pkl'
+    path = Path(cache_home) / 'fluent-python' / key
+    try:
+        with open(path, 'rb') as fp:
+            cached = pickle.load(fp)
+        if isinstance(cached, dict):
+            # pickle does not keep keys interned: intern them again
+            return {sys.intern(word): chars for word, chars in cached.items()}
+    except Exception:
+        pass  # missing, truncated, corrupt or from a newer pickle protocol
+    index = _build_name_index(start, end)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temp file and rename it, so a concurrent reader never
+        # sees half a pickle
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump(index, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+    except OSError:
+        pass  # no writable cache dir: the index is just rebuilt next time
     return index
 
+def _build_name_index(start: int, end: int) -> dict[str,str]:
+    # defaultdict builds a list only for a new word, where setdefault built
+    # an empty one on every call
+    index: defaultdict[str, list[str]] = defaultdict(list)
+    # Unicode names are upper case already and only hold [A-Z0-9 -]: split
+    # them with str.split, no regex and no .upper() per word. Names looked
+    # up in the loop are bound to locals once
+    char_name = unicodedata.name
+    index_get = index.__getitem__
+    for i in range(start, end):
+        char = chr(i)
+        if name := char_name(char, ''):
+            for word in name.replace('-', ' ').split():
+                index_get(word).append(char)
+    # each word maps to one str of its chars instead of a set of 1-char
+    # strs: far less memory, and `char in index[word]` still works. The
+    # chars come in code point order, so dropping repeats keeps it sorted.
+    # Keys are interned, so lookups with an interned word (any identifier
+    # or literal like 'LETTER') match on identity before comparing chars
+    return {sys.intern(word): ''.join(dict.fromkeys(chars))
+            for word, chars in index.items()}
+
 # Abstract Base Classes
 def name2hex(name: str, color_map: Mapping[str, int]) -> str:
     pass
@@ -136,6 +237,19 @@ def name2hex(name: str, color_map: Mapping[str, int]) -> str:
 # Iterable
 FromTo = tuple[str, str]
 def zip_replace(text: str, changes: Iterable[FromTo]) -> str:
+    changes = list(changes)
+    if all(len(from_) == 1 and len(to) <= 1 for from_, to in changes):
+        # one character for (at most) one: fold the whole chain into a single
+        # translation table, so the text is scanned once instead of once per
+        # pair. Each step also rewrites what earlier steps produced, as the
+        # chained replace calls would
+        table: dict[str, str] = {}
+        for from_, to in changes:
+            for char, current in table.items():
+                if current == from_:
+                    table[char] = to
+            table.setdefault(from_, to)
+        return text.translate(str.maketrans(table))
     for from_, to in changes:
         text = text.replace(from_, to)
     return text
@@ -145,6 +259,23 @@ text = "mad skilled noob powned leet"
 result = zip_replace(text, l33t)
 print(result)
 
+def replace_all(text: str, changes: Iterable[FromTo]) -> str:
+    """replace every pattern in a single pass over text. Unlike zip_replace,
+    replaced text is never matched again; where patterns overlap at the
+    same position, the one earlier in changes wins"""
+    targets: dict[str, str] = {}
+    for from_, to in changes:
+        if from_:
+            targets.setdefault(from_, to)
+    if not targets:
+        return text
+    # one alternation compiled from all patterns: the regex engine finds
+    # the next match of any of them, instead of one str.replace per pair
+    pattern = re.compile('|'.join(map(re.escape, targets)))
+    return pattern.sub(lambda match: targets[match.group()], text)
+
+print(replace_all('abc', [('a', 'b'), ('b', 'c')]))
+
 """
 iterable:具体应该叫做可迭代对象。他的特点其实就是我的序列的大小长度已经确定了
 (list,tuple,dict,string等)。他遵循可迭代的协议。
@@ -161,6 +292,10 @@ T = TypeVar('T')
 def sample(population: Sequence[T], size: int) -> list[T]:
     if size < 1:
         raise ValueError("size must be >= 1")
+    if size <= len(population) // 2:
+        # random.sample picks `size` items without copying and shuffling
+        # the whole population
+        return random.sample(population, size)
     result = list(population)
     shuffle(result)
     return result[:size]
@@ -175,9 +310,23 @@ def mode(data: Iterable[T]) -> T:
     pass
 
 ## Restricted TypeVar
+import numpy as np
+
 NumberT = TypeVar("NumberT", float, Decimal, Fraction)
 def mode(data:Iterable[NumberT]) -> NumberT:
-    pass
+    if isinstance(data, np.ndarray):
+        # count in C with np.unique instead of hashing each element into a
+        # Counter; among tied values the first one seen wins, as with
+        # most_common
+        if data.size == 0:
+            raise ValueError("no mode for empty data")
+        values, first, counts = np.unique(data, return_index=True, return_counts=True)
+        tied = counts == counts.max()
+        return values[tied].tolist()[first[tied].argmin()]
+    pairs = Counter(data).most_common(1)
+    if len(pairs) == 0:
+        raise ValueError("no mode for empty data")
+    return pairs[0][0]
 
 ## Bounded TypeVar type parameter may be Hashable or any subtype of it
 def mode(data: Iterable[Hashable]) -> Hashable:
@@ -192,8 +341,9 @@ def mode(data:Iterable[HashableT]) -> HashableT:
 
 # Static Protocols
 def top(series: Iterable[T], length: int) -> list[T]:
-    ordered = sorted(series, reverse=True)
-    return ordered[:length]
+    # a heap of `length` items instead of sorting the whole series; nlargest
+    # sorts by itself when length covers a sized series
+    return heapq.nlargest(length, series)
 top([4, 1, 5, 2, 6, 7, 3], 3)
 
 # constrain T
@@ -203,8 +353,9 @@ class SupportsLessThan(Protocol):
 LT = TypeVar("LT", bound=SupportsLessThan)
 
 def top(series: Iterable[LT], length: int) -> list[LT]:
-    ordered = sorted(series, reverse=True)
-    return ordered[:length]
+    # a heap of `length` items instead of sorting the whole series; nlargest
+    # sorts by itself when length covers a sized series
+    return heapq.nlargest(length, series)
 
 # Callable
 ## variance in Callable types
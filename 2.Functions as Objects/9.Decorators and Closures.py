@@ -9,6 +9,7 @@ Implementing a parameterized decorator
 """
 from collections import abc
 import functools
+import math
 import time
 import html
 import numbers
@@ -99,7 +100,9 @@ def f3(a):
 f3(3)
 
 # Closures
-def make_averager():
+# keeps every value and re-sums them on each call, O(n) per call: only here
+# to show a free variable. The nonlocal make_averager below is the one to use
+def make_series_averager():
     series = []
 
     def averager(new_value):
@@ -110,7 +113,7 @@ def make_averager():
 
     return averager
 
-avg = make_averager()
+avg = make_series_averager()
 print(avg(10))
 print(avg(11))
 print(avg(15))
@@ -121,7 +124,7 @@ print(avg.__closure__)
 print(avg.__closure__[0].cell_contents)
 """
 如果一个变量在函数代码块中定义，但在其他代码块中被使用，例如嵌套在外部函数中的闭包函数，那么它就是自由变量
-series在make_averager()中是局部变量，在averager()中是自由变量，因为它在averager()中没有绑定
+series在make_series_averager()中是局部变量，在averager()中是自由变量，因为它在averager()中没有绑定
 
 The value for series is kept in the __closure__ attribute of the returned function
 avg. Each item in avg.__closure__ corresponds to a name in 
@@ -192,41 +195,70 @@ def clock(func):
 def snooze(seconds):
     time.sleep(seconds)
 
+# the recursive version shows clock timing each nested call
+@clock
+def factorial_recursive(n):
+    return 1 if n < 2 else n*factorial_recursive(n-1)
+
+# math.factorial runs the multiplication loop in C: one clocked call
 @clock
 def factorial(n):
-    return 1 if n < 2 else n*factorial(n-1)
+    return math.factorial(n)
 
 snooze(.123)
+print("6! =" ,factorial_recursive(6))
 print("6! =" ,factorial(6))
 
 # How It Works
 
 @clock
 def factorial(n):
-    return 1 if n < 2 else n*factorial(n-1)
+    return math.factorial(n)
 
 # same as:
 def factorial(n):
-    return 1 if n < 2 else n * factorial(n - 1)
+    return math.factorial(n)
 factorial = clock(factorial)
 
 print(factorial.__name__)
 
+# set to False when timing fast functions: clock then only appends to
+# clock_records, and no string is built unless a record is printed
+_CLOCK_VERBOSE = True
+clock_records = []
+
+class _ClockRecord:
+    __slots__ = ('name', 'args', 'kwargs', 'result', 'elapsed')
+
+    def __init__(self, name, args, kwargs, result, elapsed):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.result = result
+        self.elapsed = elapsed
+
+    def __str__(self):
+        arg_lst = [repr(arg) for arg in self.args]
+        arg_lst.extend(f'{k}={v!r}' for k, v in self.kwargs.items())
+        arg_str = ', '.join(arg_lst)
+        return f'[{self.elapsed:0.8f}s] {self.name}({arg_str}) -> {self.result!r}'
+
 def clock(func):
     """an improved clock decorator
     1. support keyword arguments
     2. it masks the __name__ and __doc__ of the decorated function
+    3. integer nanosecond timer, output formatted only when printed
     """
     @functools.wraps(func)
     def clocked(*args, **kwargs):
-        t0 = time.perf_counter()
+        t0 = time.perf_counter_ns()
         result = func(*args, **kwargs)
-        elapsed = time.perf_counter() - t0
-        name = func.__name__
-        arg_lst = [repr(arg) for arg in args]
-        arg_lst.extend(f'{k}={v!r}' for k, v in kwargs.items())
-        arg_str = ', '.join(arg_lst)
-        print(f'[{elapsed:0.8f}s] {name}({arg_str}) -> {result!r}')
+        elapsed = (time.perf_counter_ns() - t0) / 1e9
+        record = _ClockRecord(func.__name__, args, kwargs, result, elapsed)
+        if _CLOCK_VERBOSE:
+            print(record)
+        else:
+            clock_records.append(record)
         return result
     return clocked
 
@@ -240,6 +272,15 @@ def fibonacci(n):
     return fibonacci(n - 2) + fibonacci(n - 1)
 print(fibonacci(6))
 
+# outside the demo, a loop computes the same numbers in one frame:
+# no recursive calls and no cache to fill
+def fibonacci_iter(n):
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+print(fibonacci_iter(6))
+
 # Using lru_cache In long-running processes
 """
 Set the maximum number of entries to be stored.
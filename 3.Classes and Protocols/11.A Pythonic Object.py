@@ -21,7 +21,8 @@ class Vector2d:
         self.y = float(y)
 
     def __iter__(self):
-        return (i for i in (self.x, self.y))
+        # a tuple iterator: no generator frame just to yield two floats
+        return iter((self.x, self.y))
 
     def __repr__(self):
         class_name = type(self).__name__
@@ -116,10 +117,12 @@ print(format(Vector2d(1, 1), '0.5fp'))
 
 # A Hashable Vector2d
 class Vector2d:
+    __slots__ = ('__x', '__y', '_hash')
     typecode = 'd'
     def __init__(self, x, y):
         self.__x = float(x)
         self.__y = float(y)
+        self._hash = None
 
     @property
     def x(self):
@@ -130,10 +133,13 @@ class Vector2d:
         return self.__y
 
     def __iter__(self):
-        return (i for i in (self.x, self.y))
+        return iter((self.x, self.y))
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        # x and y are read-only, so the hash never changes: compute it once
+        if self._hash is None:
+            self._hash = hash((self.x, self.y))
+        return self._hash
 
 v1 = Vector2d(3, 4)
 v2 = Vector2d(3.1, 4.2)
@@ -157,22 +163,24 @@ def keyword_pattern_demo(v: Vector2d) -> None:
 # Complete Listing of Vector2d, Version 3
 class Vector2d:
     __match_args__ = ('x', 'y')
+    __slots__ = ('__x', '__y', '_hash')
     typecode = 'd'
 
     def __init__(self, x, y):
         self.__x = float(x)
         self.__y = float(y)
+        self._hash = None
 
     @property
     def x(self):
         return self.__x
 
-    property
+    @property
     def y(self):
         return self.__y
 
     def __iter__(self):
-        return (i for i in (self.x, self.y))
+        return iter((self.x, self.y))
 
     def __repr__(self):
         class_name = type(self).__name__
@@ -189,7 +197,9 @@ class Vector2d:
         return tuple(self) == tuple(other)
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        if self._hash is None:
+            self._hash = hash((self.x, self.y))
+        return self._hash
 
     def __abs__(self):
         return math.hypot(self.x, self.y)
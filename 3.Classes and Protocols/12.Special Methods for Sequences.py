@@ -14,8 +14,12 @@ import collections
 import functools
 import operator
 
+import numpy as np
+
 # Vector Take #1: Vector2d Compatible
 class Vector:
+    # no per-instance __dict__; each subclass below redeclares __slots__
+    __slots__ = ('_components',)
     typecode = 'd'
 
     def __init__(self, components):
@@ -37,10 +41,14 @@ class Vector:
                 bytes(self._components))
 
     def __eq__(self, other):
+        # same class: compare the arrays in C, with no tuples of floats to
+        # build (not isinstance: this module rebinds the name Vector)
+        if type(other) is type(self):
+            return self._components == other._components
         return tuple(self) == tuple(other)
 
     def __abs__(self):
-        return math.hypot(*self)
+        return math.hypot(*self._components)
 
     def __bool__(self):
         return bool(abs(self))
@@ -73,6 +81,8 @@ class FrenchDeck:
 
 # Vector Take #2: A Sliceable Sequence
 class Vector1(Vector):
+    __slots__ = ()
+
     def __len__(self):
         return len(self._components)
 
@@ -103,11 +113,15 @@ print(slice(-3, None, None).indices(5))
 
 # A Slice-Aware __getitem__
 class Vector2(Vector):
+    __slots__ = ()
+
     def __len__(self):
         return len(self._components)
 
     def __getitem__(self, key):
         if isinstance(key, slice):
+            # type(self), not Vector2: slicing a Vector3 or Vector4 must
+            # return that same subclass
             cls = type(self)
             return cls(self._components[key])
         index = operator.index(key)
@@ -119,13 +133,13 @@ print(v7[1:4])
 
 # Vector Take #3: Dynamic Attribute Access
 class Vector3(Vector2):
+    __slots__ = ()
     __match_args__ = ('x', 'y', 'z', 't')
+    # one dict probe per lookup, no tuple scan and no ValueError on a miss
+    _attr_pos = {name: pos for pos, name in enumerate(__match_args__)}
     def __getattr__(self, name):
         cls = type(self)
-        try:
-            pos = cls.__match_args__.index(name)
-        except ValueError:
-            pos = -1
+        pos = cls._attr_pos.get(name, -1)
         if 0 <= pos < len(self._components):
             return self._components[pos]
         msg = f'{cls.__name__!r} object has no attribute {name!r}'
@@ -158,14 +172,28 @@ print(functools.reduce(lambda x, y: x^y, range(1, 6)))
 print(functools.reduce(operator.xor, range(6)))
 
 class Vector4(Vector3):
+    __slots__ = ('_hash',)
     typecode = 'd'
 
+    def __init__(self, components):
+        super().__init__(components)
+        # the components never change: __hash__ fills this in once
+        object.__setattr__(self, '_hash', None)
+
     def __eq__(self, other):
+        if type(other) is type(self):
+            return self._components == other._components
         return tuple(self) == tuple(other)
 
     def __hash__(self):
-        hashes = (hash(x) for x in self._components)
-        return functools.reduce(operator.xor, hashes, 0)
+        # the XOR of the components' IEEE 754 bit patterns, in a single
+        # NumPy reduction instead of a hash() call per component. The values
+        # differ from hash(x) of each float; + 0.0 turns -0.0 into 0.0, so
+        # vectors that compare equal still hash equal
+        if self._hash is None:
+            bits = (np.frombuffer(self._components) + 0.0).view(np.int64)
+            object.__setattr__(self, '_hash', int(np.bitwise_xor.reduce(bits)))
+        return self._hash
 
 for a, b in zip([1,2,3], [4,5,6]):
     print(a,b)
@@ -187,6 +215,7 @@ print(list(zip(*b)))
 
 # Vector Take #5: Formatting
 class Vector:
+    __slots__ = ('_components',)
     typecode = 'd'
 
     def __init__(self, components):
@@ -208,15 +237,28 @@ class Vector:
                 bytes(self._components))
 
     def __eq__(self, other):
-        return (len(self) == len(other) and
-                all(a == b for a, b in zip(self, other)))
+        # Vector is this final class by the time __eq__ runs
+        if isinstance(other, Vector):
+            return self._components == other._components
+        try:
+            return (len(self) == len(other) and
+                    all(a == b for a, b in zip(self, other)))
+        except TypeError:
+            return NotImplemented
 
     def __hash__(self):
-        hashes = (hash(x) for x in self)
-        return functools.reduce(operator.xor, hashes, 0)
+        components = self._components
+        if len(components) < 32:
+            # short vectors: the NumPy setup on each call costs more than
+            # the hash() calls it saves
+            return functools.reduce(operator.xor, map(hash, components), 0)
+        # same bit pattern XOR as Vector4.__hash__. Equal vectors have the
+        # same length, so they always take the same branch
+        bits = (np.frombuffer(components) + 0.0).view(np.int64)
+        return int(np.bitwise_xor.reduce(bits))
 
     def __abs__(self):
-        return bool(abs(self))
+        return math.hypot(*self._components)
 
     def __bool__(self):
         return bool(abs(self))
@@ -232,13 +274,11 @@ class Vector:
         return self._components[index]
 
     __match_args__ = ('x', 'y', 'z', 't')
+    _attr_pos = {name: pos for pos, name in enumerate(__match_args__)}
 
     def __getattr__(self, name):
         cls = type(self)
-        try:
-            pos = cls.__match_args__.index(name)
-        except ValueError:
-            pos = -1
+        pos = cls._attr_pos.get(name, -1)
         if 0 <= pos < len(self._components):
             return self._components[pos]
         msg = f"{cls.__name__!r} object has no attribute {name!r}"
@@ -253,13 +293,22 @@ class Vector:
             return a
 
     def angles(self):
-        return (self.angle(n) for n in range(1, len(self)))
+        # all angles at once: the suffix norms come from one running hypot
+        # instead of a hypot over each suffix, which was O(n**2). hypot
+        # scales, so huge or tiny components neither overflow nor vanish.
+        # accumulate passes the first item through as is, hence the abs
+        components = np.frombuffer(self._components)
+        suffix_norms = np.hypot.accumulate(np.abs(components[::-1]))[::-1]
+        angles = np.arctan2(suffix_norms[1:], components[:-1])
+        if len(angles) and components[-1] < 0:
+            angles[-1] = math.pi * 2 - angles[-1]
+        return angles
 
     def __format__(self, format_spec=''):
         if format_spec.endswith('h'):
             format_spec = format_spec[:-1]
             coords = itertools.chain([abs(self)],
-                                     self.angle())
+                                     self.angles())
             out_fmt = "<{}>"
 
         else:
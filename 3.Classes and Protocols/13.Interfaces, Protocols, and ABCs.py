@@ -18,12 +18,15 @@ import typing
 import numbers
 import sys
 import math
+import struct
 import numpy as np
 import decimal
+import functools
+import itertools
+from dataclasses import dataclass
 from random import shuffle
 from fractions import Fraction
 from typing import TypeVar, Protocol
-from array import array
 from typing import Any, Iterable, TYPE_CHECKING, runtime_checkable
 
 
@@ -41,16 +44,25 @@ print('E' in v)
 
 # Programming Ducks
 # dynamic protocols with two of the most important in Python: the sequence and iterable protocols.
-Card = collections.namedtuple("Card", ["rank", "suit"])
+# slotted: card.rank and card.suit are plain slot reads, not namedtuple's
+# tuple index lookups, and there is no per-card __dict__
+@dataclass(frozen=True, slots=True)
+class Card:
+    rank: str
+    suit: str
 
 
 class FrenchDeck:
     ranks = [str(n) for n in range(2, 11)] + list("JQKA")
     suits = "spades diamonds clubs hearts".split()
+    # the cards are immutable: build them once, each deck copies the list.
+    # itertools.product because a nested comprehension in a class body
+    # cannot see ranks
+    _TEMPLATE = tuple(Card(rank, suit)
+                      for suit, rank in itertools.product(suits, ranks))
 
     def __init__(self):
-        self._cards = [Card(rank, suit) for suit in self.suits
-                       for rank in self.ranks]
+        self._cards = list(self._TEMPLATE)
 
     def __len__(self):
         return len(self._cards)
@@ -58,6 +70,19 @@ class FrenchDeck:
     def __getitem__(self, position):
         return self._cards[position]
 
+    def __setitem__(self, position, card):
+        """mutable sequence protocol"""
+        self._cards[position] = card
+
+    def shuffle(self):
+        # one permutation drawn in C, instead of random.shuffle swapping
+        # cards through __getitem__/__setitem__
+        cards = self._cards
+        self._cards = [cards[i] for i in _rng.permutation(len(cards)).tolist()]
+
+
+_rng = np.random.default_rng()
+
 
 # Monkey Patching: Implementing a Protocol at Runtime
 l = list(range(10))
@@ -65,14 +90,16 @@ shuffle(l)
 deck = FrenchDeck()
 
 
-# shuffle(deck)
-# # Monkey patching FrenchDeck to make it mutable and compatible with random.shuffle
-def set_card(deck, position, card):
-    """mutable sequence protocol"""
-    deck._cards[position] = card
-
-
-FrenchDeck.__setitem__ = set_card
+# Without __setitem__, shuffle(deck) fails. Monkey patching FrenchDeck makes
+# it mutable and compatible with random.shuffle at runtime:
+#
+# def set_card(deck, position, card):
+#     deck._cards[position] = card
+#
+# FrenchDeck.__setitem__ = set_card
+#
+# FrenchDeck above defines the same __setitem__ in its class body instead:
+# patching the class at runtime invalidates the interpreter's caches for it
 shuffle(deck)
 
 from collections.abc import Iterable
@@ -96,16 +123,21 @@ def namedtuple(typename: str, field_names: Union[str, Iterable[str]]):
 
 # Goose typing in practice
 ## Suclassing an ABC
-Card = namedtuple("Card", ["rank", "suit"])
+# FrenchDeck2 uses the slotted Card from above: the namedtuple defined
+# above is only a validation sketch and returns no class
 
 
 class FrenchDeck2(collections.abc.MutableSequence):
     ranks = [str(n) for n in range(2, 11)] + list("JQKA")
     suits = "spades diamonds clubs hearts".split()
+    # the cards are immutable: build them once, each deck copies the list.
+    # itertools.product because a nested comprehension in a class body
+    # cannot see ranks
+    _TEMPLATE = tuple(Card(rank, suit)
+                      for suit, rank in itertools.product(suits, ranks))
 
     def __init__(self):
-        self._cards = [Card(rank, suit) for suit in self.suits
-                       for rank in self.ranks]
+        self._cards = list(self._TEMPLATE)
 
     def __len__(self):
         return len(self._cards)
@@ -122,6 +154,10 @@ class FrenchDeck2(collections.abc.MutableSequence):
     def insert(self, position, value):
         self._cards.insert(position, value)
 
+    def shuffle(self):
+        cards = self._cards
+        self._cards = [cards[i] for i in _rng.permutation(len(cards)).tolist()]
+
 
 ## ABCs in the Standard Library
 """
@@ -139,6 +175,8 @@ class Tombola(abc.ABC):
     """
     the definition of the Tombola ABC.
     """
+    # empty, so subclasses that declare __slots__ get instances without __dict__
+    __slots__ = ()
 
     @abc.abstractmethod
     def load(self, iterable):
@@ -156,8 +194,15 @@ class Tombola(abc.ABC):
         """Return True if there is at least 1 item, otherwise False."""
         return bool(self.inspect())
 
+    @abc.abstractmethod
     def inspect(self):
-        """Return a ssorted tuple with the items currently inside."""
+        """Return a tuple with the items currently inside.
+        Subclasses know their storage and can copy it in O(n); the generic
+        _inspect_by_draining is there for those that cannot.
+        """
+
+    def _inspect_by_draining(self):
+        """Pick every item, then load them all back."""
         items = []
         while True:
             try:
@@ -178,9 +223,16 @@ class MyABC(abc.ABC):
 
 
 ## Subclassing an ABC
+# SystemRandom keeps no state of its own, each call reads the OS source:
+# one instance can serve every cage
+_SYSRAND = random.SystemRandom()
+
+
 class BingoCage(Tombola):
+    __slots__ = ('_randomizer', '_items')
+
     def __init__(self, items):
-        self._randomizer = random.SystemRandom()
+        self._randomizer = _SYSRAND
         self._items = []
         self.load(items)
 
@@ -195,12 +247,15 @@ class BingoCage(Tombola):
             raise LookupError("pick from empty BingoCage")
 
     def __call__(self):
-        self.pick()
+        return self.pick()
+
+    def inspect(self):
+        return tuple(self._items)
 
 
 class LottoBlower(Tombola):
     def __init__(self, iterable):
-        self_balls = list(iterable)
+        self._balls = list(iterable)
 
     def load(self, iterable):
         self._balls.extend(iterable)
@@ -210,7 +265,11 @@ class LottoBlower(Tombola):
             position = random.randrange(len(self._balls))
         except ValueError:
             raise LookupError("pick from empty LottoBlower")
-        return self._balls.pop(position)
+        # the order of the balls does not matter: move the picked one to the
+        # end and pop it there, O(1) instead of shifting every later ball
+        balls = self._balls
+        balls[position], balls[-1] = balls[-1], balls[position]
+        return balls.pop()
 
     def loaded(self):
         return bool(self._balls)
@@ -312,6 +371,17 @@ class SupportsComplex(Protocol):
 c64 = np.complex64(3 + 4j)
 print(isinstance(c64, complex))
 print(isinstance(c64, typing.SupportsComplex))
+print(isinstance(c64, SupportsComplex))
+
+
+def supports_complex(x) -> bool:
+    """the isinstance(x, SupportsComplex) answer for a protocol whose only
+    member is a method: one probe of the type, not the protocol machinery.
+    Nothing is cached, so a method monkey patched in later is seen"""
+    return hasattr(type(x), '__complex__')
+
+
+print(supports_complex(c64))
 
 c = complex(c64)
 print(c)
@@ -323,9 +393,29 @@ print(isinstance(c64, numbers.Complex))
 
 
 # Supporting a Static Protocol
+@functools.lru_cache(maxsize=32)
+def _vector2d_formatter(format_spec):
+    """Return (polar, formatter) for format_spec; the spec is parsed once,
+    the function is reused. A polar formatter takes abs(v) and v.angle(),
+    a cartesian one takes x and y"""
+    if format_spec.endswith('p'):
+        spec = format_spec[:-1]
+
+        def formatter(magnitude, angle):
+            return f'<{magnitude:{spec}}, {angle:{spec}}>'
+        return True, formatter
+
+    def formatter(x, y):
+        return f'({x:{format_spec}}, {y:{format_spec}})'
+    return False, formatter
+
+
 class Vector2d:
     __match_args__ = ('x', 'y')
     typecode = 'd'
+    # typecode byte and two doubles, native byte order and no padding:
+    # the same bytes as the array version, which from_bytes reads back
+    _struct = struct.Struct('=c2d')
 
     def __init__(self, x, y):
         self.__x = float(x)
@@ -335,50 +425,54 @@ class Vector2d:
     def x(self):
         return self.__x
 
-    property
-
+    @property
     def y(self):
         return self.__y
 
     def __iter__(self):
-        return (i for i in (self.x, self.y))
+        # a tuple iterator over the private fields: no generator frame and
+        # no property calls
+        return iter((self.__x, self.__y))
 
     def __repr__(self):
         class_name = type(self).__name__
         return '{}({!r}, {!r})'.format(class_name, *self)
 
     def __str__(self):
-        return str(tuple(self))
+        return f'({self.__x!r}, {self.__y!r})'
 
     def __bytes__(self):
-        return (bytes([ord(self.typecode)]) +
-                bytes(array(self.typecode, self)))
+        return self._struct.pack(self.typecode.encode(), self.__x, self.__y)
 
     def __eq__(self, other):
+        # compare the floats directly, building no tuples, when the other
+        # operand is a Vector2d; anything else is compared as a tuple
+        if isinstance(other, Vector2d):
+            return self.__x == other.__x and self.__y == other.__y
         return tuple(self) == tuple(other)
 
     def __hash__(self):
-        return hash((self.x, self.y))
+        # __eq__ accepts plain tuples, so the hash must be the (x, y) tuple's
+        return hash((self.__x, self.__y))
 
+    # the numeric methods read the private fields directly, skipping the
+    # property calls; math.hypot and math.atan2 already run in C
     def __abs__(self):
-        return math.hypot(self.x, self.y)
+        return math.hypot(self.__x, self.__y)
 
     def __bool__(self):
         return bool(abs(self))
 
     def angle(self):
-        return math.atan2(self.y, self.x)
+        return math.atan2(self.__y, self.__x)
 
     def __format__(self, format_spec=''):
-        if format_spec.endswith('p'):
-            format_spec = format_spec[:-1]
-            coords = (abs(self), self.angle())
-            outer_fmt = "<{}, {}>"
-        else:
-            coords = self
-            outer_fmt = "({}, {})"
-        components = (format(c, format_spec) for c in coords)
-        return outer_fmt.format(*components)
+        polar, formatter = _vector2d_formatter(format_spec)
+        if polar:
+            # through abs and angle, so subclasses overriding them format
+            # with their own values
+            return formatter(abs(self), self.angle())
+        return formatter(self.__x, self.__y)
 
     @classmethod
     def from_bytes(cls, octets):
@@ -387,7 +481,7 @@ class Vector2d:
         return cls(*memv)
 
     def __complex__(self):
-        return complex(self.x, self.y)
+        return complex(self.__x, self.__y)
 
     @classmethod
     def fromcomplex(cls, datum):
@@ -453,4 +547,15 @@ print([isinstance(x, typing.SupportsComplex) for x in sample])
 print([complex(x) for x in sample])
 
 def to_complex(n: typing.SupportsComplex) -> complex:
-    return complex(n)
\ No newline at end of file
+    return complex(n)
+
+def to_complex_batch(values: Iterable[typing.SupportsComplex]) -> np.ndarray:
+    # numeric values become one NumPy array, cast by a single C loop;
+    # anything else (Fraction, Decimal) lands in an object array, whose
+    # cast still calls complex() on each element. np.asarray needs a
+    # sequence: a generator would become a 0-d object array
+    if not isinstance(values, np.ndarray):
+        values = list(values)
+    return np.asarray(values).astype(complex, copy=False)
+
+print(to_complex_batch(sample))
\ No newline at end of file
@@ -152,6 +152,10 @@ object, but only adds or customizes the behavior of child or sibling classes.
 
 ## Case-Insensitive Mappings
 def _upper(key):
+    # str keys, by far the most common, skip the try block; bytes keys
+    # still get upper-cased below
+    if isinstance(key, str):
+        return key.upper()
     try:
         return key.upper()
     except AttributeError: